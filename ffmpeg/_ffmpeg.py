@@ -1,6 +1,5 @@
 from __future__ import unicode_literals
 
-from past.builtins import basestring
 from ._utils import basestring
 
 from .nodes import (
@@ -32,28 +31,28 @@ def input(filename, **kwargs):
     return InputNode(input.__name__, kwargs=kwargs).stream()
 
 
-@output_operator()
+@output_operator
 def global_args(stream, *args):
     """Add extra global command-line argument(s), e.g. ``-progress``."""
     return GlobalNode(stream, global_args.__name__, args).stream()
 
 
-@output_operator()
+@output_operator
 def overwrite_output(stream):
     """Overwrite output files without asking (ffmpeg ``-y`` option)
 
     Official documentation: `Main options <https://ffmpeg.org/ffmpeg.html#Main-options>`__
     """
-    return GlobalNode(stream, overwrite_output.__name__, ['-y']).stream()
+    return GlobalNode(stream, overwrite_output.__name__, ('-y',)).stream()
 
 
-@output_operator()
+@output_operator
 def merge_outputs(*streams):
     """Include all given outputs in one ffmpeg command line"""
     return MergeOutputsNode(streams, merge_outputs.__name__).stream()
 
 
-@filter_operator()
+@filter_operator
 def output(*streams_and_filename, **kwargs):
     """Output file URL
 
@@ -1,10 +1,72 @@
 from __future__ import unicode_literals
 
-from .nodes import FilterNode, filter_operator
-from ._utils import escape_chars
+from .nodes import FilterNode, Stream, filter_operator
+from ._utils import escape_chars, get_typed_args_key
+import weakref
 
 
-@filter_operator()
+_filter_node_cache = weakref.WeakValueDictionary()
+_filter_stream_cache = weakref.WeakValueDictionary()
+
+
+def _get_filter_cache_key(stream, filter_name, args, kwargs):
+    """Get the key under which a single-input filter applied to ``stream`` is cached,
+    or ``None`` if the filter can't be cached.
+
+    The upstream node is matched by identity, so a hit is always built on top of the
+    very node it was asked for; the cached node keeps its upstream alive, so the
+    ``id`` can't be reused while the entry exists. Args and kwargs are keyed the same
+    way as node equality.
+    """
+    if not isinstance(stream, Stream):
+        return None
+    key = (
+        id(stream.node),
+        stream.label,
+        stream.selector,
+        filter_name,
+        get_typed_args_key(args, sorted(kwargs.items())),
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _cached_filter_node(stream, filter_name, args=(), kwargs=None):
+    """Get a single-input ``FilterNode``, reusing an equivalent one if it was already
+    built on top of the same upstream stream.
+    """
+    if kwargs is None:
+        kwargs = {}
+    key = _get_filter_cache_key(stream, filter_name, args, kwargs)
+    if key is None:
+        return FilterNode(stream, filter_name, args=args, kwargs=kwargs)
+    node = _filter_node_cache.get(key)
+    if node is None:
+        node = FilterNode(stream, filter_name, args=args, kwargs=kwargs)
+        _filter_node_cache[key] = node
+    return node
+
+
+def _cached_filter(stream, filter_name, args=(), kwargs=None):
+    """Like ``_cached_filter_node``, but get the outgoing stream of a single-output
+    filter, so that repeated calls return the very same ``Stream``.
+    """
+    if kwargs is None:
+        kwargs = {}
+    key = _get_filter_cache_key(stream, filter_name, args, kwargs)
+    if key is None:
+        return FilterNode(stream, filter_name, args=args, kwargs=kwargs).stream()
+    downstream = _filter_stream_cache.get(key)
+    if downstream is None:
+        downstream = FilterNode(stream, filter_name, args=args, kwargs=kwargs).stream()
+        _filter_stream_cache[key] = downstream
+    return downstream
+
+
+@filter_operator
 def filter_multi_output(stream_spec, filter_name, *args, **kwargs):
     """Apply custom filter with one or more outputs.
 
@@ -28,7 +90,7 @@ def filter_multi_output(stream_spec, filter_name, *args, **kwargs):
     )
 
 
-@filter_operator()
+@filter_operator
 def filter(stream_spec, filter_name, *args, **kwargs):
     """Apply custom filter.
 
@@ -50,28 +112,32 @@ def filter(stream_spec, filter_name, *args, **kwargs):
 
         ``ffmpeg.input('in.mp4').filter('hflip').output('out.mp4').run()``
     """
-    return filter_multi_output(stream_spec, filter_name, *args, **kwargs).stream()
+    return FilterNode(
+        stream_spec, filter_name, args=args, kwargs=kwargs, max_inputs=None
+    ).stream()
 
 
-@filter_operator()
+@filter_operator
 def filter_(stream_spec, filter_name, *args, **kwargs):
     """Alternate name for ``filter``, so as to not collide with the
     built-in python ``filter`` operator.
     """
-    return filter(stream_spec, filter_name, *args, **kwargs)
+    return FilterNode(
+        stream_spec, filter_name, args=args, kwargs=kwargs, max_inputs=None
+    ).stream()
 
 
-@filter_operator()
+@filter_operator
 def split(stream):
-    return FilterNode(stream, split.__name__)
+    return _cached_filter_node(stream, 'split')
 
 
-@filter_operator()
+@filter_operator
 def asplit(stream):
-    return FilterNode(stream, asplit.__name__)
+    return _cached_filter_node(stream, 'asplit')
 
 
-@filter_operator()
+@filter_operator
 def setpts(stream, expr):
     """Change the PTS (presentation timestamp) of the input frames.
 
@@ -81,10 +147,10 @@ def setpts(stream, expr):
 
     Official documentation: `setpts, asetpts <https://ffmpeg.org/ffmpeg-filters.html#setpts_002c-asetpts>`__
     """
-    return FilterNode(stream, setpts.__name__, args=[expr]).stream()
+    return _cached_filter(stream, 'setpts', args=(expr,))
 
 
-@filter_operator()
+@filter_operator
 def trim(stream, **kwargs):
     """Trim the input so that the output contains one continuous subpart of the input.
 
@@ -104,10 +170,10 @@ def trim(stream, **kwargs):
 
     Official documentation: `trim <https://ffmpeg.org/ffmpeg-filters.html#trim>`__
     """
-    return FilterNode(stream, trim.__name__, kwargs=kwargs).stream()
+    return _cached_filter(stream, 'trim', kwargs=kwargs)
 
 
-@filter_operator()
+@filter_operator
 def overlay(main_parent_node, overlay_parent_node, eof_action='repeat', **kwargs):
     """Overlay one video on top of another.
 
@@ -156,34 +222,33 @@ def overlay(main_parent_node, overlay_parent_node, eof_action='repeat', **kwargs
 
     Official documentation: `overlay <https://ffmpeg.org/ffmpeg-filters.html#overlay-1>`__
     """
-    kwargs['eof_action'] = eof_action
     return FilterNode(
         [main_parent_node, overlay_parent_node],
-        overlay.__name__,
-        kwargs=kwargs,
+        'overlay',
+        kwargs=dict(kwargs, eof_action=eof_action),
         max_inputs=2,
     ).stream()
 
 
-@filter_operator()
+@filter_operator
 def hflip(stream):
     """Flip the input video horizontally.
 
     Official documentation: `hflip <https://ffmpeg.org/ffmpeg-filters.html#hflip>`__
     """
-    return FilterNode(stream, hflip.__name__).stream()
+    return _cached_filter(stream, 'hflip')
 
 
-@filter_operator()
+@filter_operator
 def vflip(stream):
     """Flip the input video vertically.
 
     Official documentation: `vflip <https://ffmpeg.org/ffmpeg-filters.html#vflip>`__
     """
-    return FilterNode(stream, vflip.__name__).stream()
+    return _cached_filter(stream, 'vflip')
 
 
-@filter_operator()
+@filter_operator
 def crop(stream, x, y, width, height, **kwargs):
     """Crop the input video.
 
@@ -198,11 +263,11 @@ def crop(stream, x, y, width, height, **kwargs):
     Official documentation: `crop <https://ffmpeg.org/ffmpeg-filters.html#crop>`__
     """
     return FilterNode(
-        stream, crop.__name__, args=[width, height, x, y], kwargs=kwargs
+        stream, 'crop', args=(width, height, x, y), kwargs=kwargs
     ).stream()
 
 
-@filter_operator()
+@filter_operator
 def drawbox(stream, x, y, width, height, color, thickness=None, **kwargs):
     """Draw a colored box on the input image.
 
@@ -229,13 +294,13 @@ def drawbox(stream, x, y, width, height, color, thickness=None, **kwargs):
     Official documentation: `drawbox <https://ffmpeg.org/ffmpeg-filters.html#drawbox>`__
     """
     if thickness:
-        kwargs['t'] = thickness
+        kwargs = dict(kwargs, t=thickness)
     return FilterNode(
-        stream, drawbox.__name__, args=[x, y, width, height, color], kwargs=kwargs
+        stream, 'drawbox', args=(x, y, width, height, color), kwargs=kwargs
     ).stream()
 
 
-@filter_operator()
+@filter_operator
 def drawtext(stream, text=None, x=0, y=0, escape_text=True, **kwargs):
     """Draw a text string or text from a specified file on top of a video, using the
     libfreetype library.
@@ -399,10 +464,10 @@ def drawtext(stream, text=None, x=0, y=0, escape_text=True, **kwargs):
         kwargs['x'] = x
     if y != 0:
         kwargs['y'] = y
-    return filter(stream, drawtext.__name__, **kwargs)
+    return _cached_filter(stream, 'drawtext', kwargs=kwargs)
 
 
-@filter_operator()
+@filter_operator
 def concat(*streams, **kwargs):
     """Concatenate audio and video streams, joining them together one after the other.
 
@@ -440,11 +505,15 @@ def concat(*streams, **kwargs):
                 stream_count, video_stream_count, audio_stream_count, len(streams)
             )
         )
-    kwargs['n'] = int(len(streams) / stream_count)
-    return FilterNode(streams, concat.__name__, kwargs=kwargs, max_inputs=None).stream()
+    return FilterNode(
+        streams,
+        'concat',
+        kwargs=dict(kwargs, n=int(len(streams) / stream_count)),
+        max_inputs=None,
+    ).stream()
 
 
-@filter_operator()
+@filter_operator
 def zoompan(stream, **kwargs):
     """Apply Zoom & Pan effect.
 
@@ -460,10 +529,10 @@ def zoompan(stream, **kwargs):
 
     Official documentation: `zoompan <https://ffmpeg.org/ffmpeg-filters.html#zoompan>`__
     """
-    return FilterNode(stream, zoompan.__name__, kwargs=kwargs).stream()
+    return _cached_filter(stream, 'zoompan', kwargs=kwargs)
 
 
-@filter_operator()
+@filter_operator
 def hue(stream, **kwargs):
     """Modify the hue and/or the saturation of the input.
 
@@ -479,16 +548,16 @@ def hue(stream, **kwargs):
 
     Official documentation: `hue <https://ffmpeg.org/ffmpeg-filters.html#hue>`__
     """
-    return FilterNode(stream, hue.__name__, kwargs=kwargs).stream()
+    return _cached_filter(stream, 'hue', kwargs=kwargs)
 
 
-@filter_operator()
+@filter_operator
 def colorchannelmixer(stream, *args, **kwargs):
     """Adjust video input frames by re-mixing color channels.
 
     Official documentation: `colorchannelmixer <https://ffmpeg.org/ffmpeg-filters.html#colorchannelmixer>`__
     """
-    return FilterNode(stream, colorchannelmixer.__name__, kwargs=kwargs).stream()
+    return FilterNode(stream, 'colorchannelmixer', kwargs=kwargs).stream()
 
 
 __all__ = [
@@ -1,4 +1,3 @@
-import json
 import subprocess
 from ._run import Error
 from ._utils import convert_kwargs_to_cmd_line_args
@@ -24,6 +23,9 @@ def probe(filename, cmd='ffprobe', timeout=None, **kwargs):
     out, err = p.communicate(**communicate_kwargs)
     if p.returncode != 0:
         raise Error('ffprobe', out, err)
+
+    import json
+
     return json.loads(out.decode('utf-8'))
 
 
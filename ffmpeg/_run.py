@@ -3,9 +3,13 @@ from .dag import get_outgoing_edges, topo_sort
 from ._utils import basestring, convert_kwargs_to_cmd_line_args
 from builtins import str
 from functools import reduce
+import atexit
 import copy
+import io
 import operator
+import os
 import subprocess
+import weakref
 
 from ._ffmpeg import input, output
 from .nodes import (
@@ -23,6 +27,17 @@ except ImportError:
     from collections import Iterable
 
 
+# Filter graphs longer than this many bytes (UTF-8 encoded) are handed to ffmpeg
+# through a file instead of the command line, to stay clear of per-argument OS
+# limits (e.g. 128KiB on Linux).
+_MAX_FILTER_COMPLEX_ARG_LEN = 100000
+
+# Filter graph script files written for running processes. ``run`` removes its own
+# as soon as ffmpeg exits, ``run_async`` once the returned process object is garbage
+# collected (Python 3); whatever is left is removed when Python exits.
+_filter_complex_scripts = set()
+
+
 class Error(Exception):
     def __init__(self, cmd, stdout, stderr):
         super(Error, self).__init__(
@@ -110,6 +125,47 @@ def _get_filter_arg(filter_nodes, outgoing_edge_maps, stream_name_map):
     return ';'.join(filter_specs)
 
 
+def _remove_filter_complex_script(path):
+    _filter_complex_scripts.discard(path)
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+@atexit.register
+def _remove_filter_complex_scripts():
+    for path in list(_filter_complex_scripts):
+        _remove_filter_complex_script(path)
+
+
+def _write_filter_complex_script(filter_arg):
+    import tempfile
+
+    fd, path = tempfile.mkstemp(prefix='ffmpeg-filter-', suffix='.txt')
+    with io.open(fd, 'w', encoding='utf-8') as f:
+        f.write(filter_arg)
+    _filter_complex_scripts.add(path)
+    return path
+
+
+def _use_filter_complex_script(args):
+    """Move a ``-filter_complex`` value that is too long to be passed on the command
+    line into a temporary file, passed with ``-filter_complex_script`` instead.
+
+    Returns the updated args and the path of the file, or ``None`` if not needed.
+    """
+    if '-filter_complex' not in args:
+        return args, None
+    index = args.index('-filter_complex')
+    filter_arg = args[index + 1]
+    if len(filter_arg.encode('utf-8')) <= _MAX_FILTER_COMPLEX_ARG_LEN:
+        return args, None
+    path = _write_filter_complex_script(filter_arg)
+    args = args[:index] + ['-filter_complex_script', path] + args[index + 2 :]
+    return args, path
+
+
 def _get_global_args(node):
     return list(node.args)
 
@@ -148,7 +204,7 @@ def _get_output_args(node, stream_name_map):
     return args
 
 
-@output_operator()
+@output_operator
 def get_args(stream_spec, overwrite_output=False):
     """Build command-line arguments to be passed to ffmpeg."""
     nodes = get_stream_spec_nodes(stream_spec)
@@ -173,7 +229,7 @@ def get_args(stream_spec, overwrite_output=False):
     return args
 
 
-@output_operator()
+@output_operator
 def compile(stream_spec, cmd='ffmpeg', overwrite_output=False):
     """Build command-line for invoking ffmpeg.
 
@@ -192,7 +248,43 @@ def compile(stream_spec, cmd='ffmpeg', overwrite_output=False):
     return cmd + get_args(stream_spec, overwrite_output=overwrite_output)
 
 
-@output_operator()
+def _run_async(
+    stream_spec,
+    cmd,
+    pipe_stdin,
+    pipe_stdout,
+    pipe_stderr,
+    quiet,
+    overwrite_output,
+    cwd,
+):
+    """Start ffmpeg like ``run_async``, but also return the path of the filter graph
+    script file it reads, or ``None``.
+    """
+    args = compile(stream_spec, cmd, overwrite_output=overwrite_output)
+    args, script_path = _use_filter_complex_script(args)
+    stdin_stream = subprocess.PIPE if pipe_stdin else None
+    stdout_stream = subprocess.PIPE if pipe_stdout else None
+    stderr_stream = subprocess.PIPE if pipe_stderr else None
+    if quiet:
+        stderr_stream = subprocess.STDOUT
+        stdout_stream = subprocess.DEVNULL
+    try:
+        process = subprocess.Popen(
+            args,
+            stdin=stdin_stream,
+            stdout=stdout_stream,
+            stderr=stderr_stream,
+            cwd=cwd,
+        )
+    except Exception:
+        if script_path is not None:
+            _remove_filter_complex_script(script_path)
+        raise
+    return process, script_path
+
+
+@output_operator
 def run_async(
     stream_spec,
     cmd='ffmpeg',
@@ -205,6 +297,11 @@ def run_async(
 ):
     """Asynchronously invoke ffmpeg for the supplied node graph.
 
+    Very long filter graphs are written to a temporary file and passed with
+    ``-filter_complex_script`` rather than ``-filter_complex``; the file is removed
+    once the returned process object is garbage collected (or, on Python 2, when the
+    Python process exits).
+
     Args:
         pipe_stdin: if True, connect pipe to subprocess stdin (to be
             used with ``pipe:`` ffmpeg inputs).
@@ -280,23 +377,22 @@ def run_async(
 
     .. _subprocess Popen: https://docs.python.org/3/library/subprocess.html#popen-objects
     """
-    args = compile(stream_spec, cmd, overwrite_output=overwrite_output)
-    stdin_stream = subprocess.PIPE if pipe_stdin else None
-    stdout_stream = subprocess.PIPE if pipe_stdout else None
-    stderr_stream = subprocess.PIPE if pipe_stderr else None
-    if quiet:
-        stderr_stream = subprocess.STDOUT
-        stdout_stream = subprocess.DEVNULL
-    return subprocess.Popen(
-        args,
-        stdin=stdin_stream,
-        stdout=stdout_stream,
-        stderr=stderr_stream,
-        cwd=cwd,
+    process, script_path = _run_async(
+        stream_spec,
+        cmd,
+        pipe_stdin,
+        pipe_stdout,
+        pipe_stderr,
+        quiet,
+        overwrite_output,
+        cwd,
     )
+    if script_path is not None and hasattr(weakref, 'finalize'):
+        weakref.finalize(process, _remove_filter_complex_script, script_path)
+    return process
 
 
-@output_operator()
+@output_operator
 def run(
     stream_spec,
     cmd='ffmpeg',
@@ -321,7 +417,7 @@ def run(
 
     Returns: (out, err) tuple containing captured stdout and stderr data.
     """
-    process = run_async(
+    process, script_path = _run_async(
         stream_spec,
         cmd,
         pipe_stdin=input is not None,
@@ -331,7 +427,11 @@ def run(
         overwrite_output=overwrite_output,
         cwd=cwd,
     )
-    out, err = process.communicate(input)
+    try:
+        out, err = process.communicate(input)
+    finally:
+        if script_path is not None:
+            _remove_filter_complex_script(script_path)
     retcode = process.poll()
     if retcode:
         raise Error('ffmpeg', out, err)
@@ -1,7 +1,5 @@
 from __future__ import unicode_literals
 from builtins import str
-from past.builtins import basestring
-import hashlib
 import sys
 
 
@@ -70,24 +68,43 @@ def _recursive_repr(item):
     return result
 
 
-def get_hash(item):
-    repr_ = _recursive_repr(item).encode('utf-8')
-    return hashlib.md5(repr_).hexdigest()
+def intern_str(text):
+    """Intern plain strings so that repeated names share one object.
+
+    Only done on Python 3, since Python 2's ``intern`` rejects unicode strings.
+    """
+    if sys.version_info.major >= 3 and type(text) is str:
+        return sys.intern(text)
+    return text
+
+
+def get_typed_args_key(args, kwargs_items):
+    """Get a key for ``args`` and ``(key, value)`` kwargs items that pairs each value
+    with its type, so that e.g. ``1`` and ``1.0`` (which compare and hash the same)
+    don't match; they render differently on the command line.
+    """
+    return (
+        tuple((type(x), x) for x in args),
+        tuple((k, type(v), v) for k, v in kwargs_items),
+    )
 
 
-def get_hash_int(item):
-    return int(get_hash(item), base=16)
+# Maps each ``chars`` argument of ``escape_chars`` to its list of
+# ``(char, escaped_char)`` replacements, with the backslash (if any) first.
+_escape_replacements = {}
 
 
 def escape_chars(text, chars):
     """Helper function to escape uncomfortable characters."""
+    replacements = _escape_replacements.get(chars)
+    if replacements is None:
+        ordered_chars = sorted(set(chars), key=lambda ch: ch != '\\')
+        replacements = [(ch, '\\' + ch) for ch in ordered_chars]
+        _escape_replacements[chars] = replacements
     text = str(text)
-    chars = list(set(chars))
-    if '\\' in chars:
-        chars.remove('\\')
-        chars.insert(0, '\\')
-    for ch in chars:
-        text = text.replace(ch, '\\' + ch)
+    for ch, escaped_ch in replacements:
+        if ch in text:
+            text = text.replace(ch, escaped_ch)
     return text
 
 
@@ -3,7 +3,6 @@ from __future__ import unicode_literals
 from builtins import str
 from .dag import get_outgoing_edges
 from ._run import topo_sort
-import tempfile
 
 from ffmpeg.nodes import (
     FilterNode,
@@ -29,7 +28,7 @@ def _get_node_color(node):
     return color
 
 
-@stream_operator()
+@stream_operator
 def view(stream_spec, detail=False, filename=None, pipe=False, **kwargs):
     try:
         import graphviz
@@ -43,6 +42,8 @@ def view(stream_spec, detail=False, filename=None, pipe=False, **kwargs):
     if pipe and filename is not None:
         raise ValueError('Can\'t specify both `filename` and `pipe`')
     elif not pipe and filename is None:
+        import tempfile
+
         filename = tempfile.mktemp()
 
     nodes = get_stream_spec_nodes(stream_spec)
@@ -55,6 +56,8 @@ def view(stream_spec, detail=False, filename=None, pipe=False, **kwargs):
             'Invalid kwargs key(s): {}'.format(', '.join(list(kwargs.keys())))
         )
 
+    # Distinct nodes may share a hash, so number them instead.
+    node_ids = {node: str(i) for i, node in enumerate(sorted_nodes)}
     for node in sorted_nodes:
         color = _get_node_color(node)
 
@@ -68,7 +71,7 @@ def view(stream_spec, detail=False, filename=None, pipe=False, **kwargs):
         else:
             node_text = node.short_repr
         graph.node(
-            str(hash(node)), node_text, shape='box', style='filled', fillcolor=color
+            node_ids[node], node_text, shape='box', style='filled', fillcolor=color
         )
         outgoing_edge_map = outgoing_edge_maps.get(node, {})
 
@@ -94,8 +97,8 @@ def view(stream_spec, detail=False, filename=None, pipe=False, **kwargs):
                 else:
                     middle = ''
                 kwargs['label'] = '{}  {}  {}'.format(up_label, middle, down_label)
-            upstream_node_id = str(hash(edge.upstream_node))
-            downstream_node_id = str(hash(edge.downstream_node))
+            upstream_node_id = node_ids[edge.upstream_node]
+            downstream_node_id = node_ids[edge.downstream_node]
             graph.edge(upstream_node_id, downstream_node_id, **kwargs)
 
     if pipe:
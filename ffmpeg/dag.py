@@ -1,6 +1,6 @@
 from __future__ import unicode_literals
 
-from ._utils import get_hash, get_hash_int
+from ._utils import _recursive_repr, get_typed_args_key, intern_str
 from builtins import object
 from collections import namedtuple
 
@@ -33,8 +33,10 @@ class DagNode(object):
         working backwards.
 
     Hashing:
-        DagNodes must be hashable, and two nodes are considered to be equivalent if
-        they have the same hash value.
+        DagNodes must be hashable, and equivalent nodes must have the same hash
+        value.  The hash only serves as a fast reject, though: distinct nodes may
+        share a hash, so equality compares the nodes (and everything upstream of
+        them) structurally.
 
         Nodes are immutable, and the hash should remain constant as a result.  If a
         node with new contents is required, create a new node and throw the old one
@@ -50,13 +52,15 @@ class DagNode(object):
         constant.
     """
 
+    __slots__ = ('__weakref__',)
+
     def __hash__(self):
         """Return an integer hash of the node."""
         raise NotImplementedError()
 
     def __eq__(self, other):
-        """Compare two nodes; implementations should return True if (and only if)
-        hashes match.
+        """Compare two nodes structurally; implementations may use the hash to reject
+        unequal nodes early, but must not treat equal hashes as equal nodes.
         """
         raise NotImplementedError()
 
@@ -93,87 +97,142 @@ DagEdge = namedtuple(
 
 
 def get_incoming_edges(downstream_node, incoming_edge_map):
-    edges = []
-    for downstream_label, upstream_info in list(incoming_edge_map.items()):
-        upstream_node, upstream_label, upstream_selector = upstream_info
-        edges += [
-            DagEdge(
-                downstream_node,
-                downstream_label,
-                upstream_node,
-                upstream_label,
-                upstream_selector,
-            )
-        ]
-    return edges
+    # ``upstream_info`` is ``(upstream_node, upstream_label, upstream_selector)``.
+    return [
+        DagEdge(downstream_node, downstream_label, *upstream_info)
+        for downstream_label, upstream_info in incoming_edge_map.items()
+    ]
 
 
 def get_outgoing_edges(upstream_node, outgoing_edge_map):
-    edges = []
-    for upstream_label, downstream_infos in sorted(outgoing_edge_map.items()):
-        for downstream_info in downstream_infos:
-            downstream_node, downstream_label, downstream_selector = downstream_info
-            edges += [
-                DagEdge(
-                    downstream_node,
-                    downstream_label,
-                    upstream_node,
-                    upstream_label,
-                    downstream_selector,
-                )
-            ]
-    return edges
+    return [
+        DagEdge(
+            downstream_node,
+            downstream_label,
+            upstream_node,
+            upstream_label,
+            downstream_selector,
+        )
+        for upstream_label, downstream_infos in sorted(outgoing_edge_map.items())
+        for downstream_node, downstream_label, downstream_selector in downstream_infos
+    ]
 
 
 class KwargReprNode(DagNode):
     """A DagNode that can be represented as a set of args+kwargs."""
 
-    @property
-    def __upstream_hashes(self):
-        hashes = []
-        for downstream_label, upstream_info in list(self.incoming_edge_map.items()):
-            upstream_node, upstream_label, upstream_selector = upstream_info
-            hashes += [
-                hash(x)
-                for x in [
-                    downstream_label,
-                    upstream_node,
-                    upstream_label,
-                    upstream_selector,
-                ]
-            ]
-        return hashes
+    __slots__ = (
+        '__incoming_edge_map',
+        'name',
+        'args',
+        'kwargs',
+        '_sorted_kwargs',
+        '__hash',
+        '__digest',
+    )
 
     @property
     def __inner_hash(self):
-        props = {'args': self.args, 'kwargs': self.kwargs}
-        return get_hash(props)
+        try:
+            return hash(self.__get_key())
+        except TypeError:
+            # Unhashable values, e.g. ``streamid=['0:0x101', '1:0x102']``.
+            props = {'args': self.args, 'kwargs': self.kwargs}
+            return hash((self.name, _recursive_repr(props)))
 
     def __get_hash(self):
-        hashes = self.__upstream_hashes + [self.__inner_hash]
-        return get_hash_int(hashes)
+        # Upstream nodes already hold their hash, so each incoming edge costs O(1).
+        incoming_edges = tuple(self.__incoming_edge_map.items())
+        return hash((incoming_edges, self.__inner_hash))
 
     def __init__(self, incoming_edge_map, name, args, kwargs):
         self.__incoming_edge_map = incoming_edge_map
-        self.name = name
+        self.name = intern_str(name)
         self.args = args
         self.kwargs = kwargs
+        self._sorted_kwargs = tuple(sorted(kwargs.items()))
         self.__hash = self.__get_hash()
+        self.__digest = None
 
     def __hash__(self):
         return self.__hash
 
+    def __get_key(self):
+        # Hashed by ``__inner_hash`` and compared by ``__eq__``.
+        typed_args_key = get_typed_args_key(self.args, self._sorted_kwargs)
+        return type(self), self.name, typed_args_key
+
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        # The hash is only a fast reject: builtin ``hash()`` collides on ordinary
+        # values (e.g. ``hash(-1) == hash(-2)``), so compare the graphs themselves.
+        # Upstream nodes are walked iteratively to stay clear of the recursion limit
+        # on long chains.
+        if not isinstance(other, KwargReprNode):
+            return False
+        pending = [(self, other)]
+        compared = set()
+        while pending:
+            node, other = pending.pop()
+            if node is other or (id(node), id(other)) in compared:
+                continue
+            compared.add((id(node), id(other)))
+            if node.__hash != other.__hash or node.__get_key() != other.__get_key():
+                return False
+            edge_map = node.__incoming_edge_map
+            other_edge_map = other.__incoming_edge_map
+            if len(edge_map) != len(other_edge_map):
+                return False
+            for label, edge in edge_map.items():
+                other_edge = other_edge_map.get(label)
+                if other_edge is None or edge[1:] != other_edge[1:]:
+                    return False
+                pending.append((edge[0], other_edge[0]))
+        return True
+
+    def __get_digest(self):
+        import hashlib
+
+        args = [(type(x).__name__, _recursive_repr(x)) for x in self.args]
+        kwargs = [
+            (k, type(v).__name__, _recursive_repr(v)) for k, v in self._sorted_kwargs
+        ]
+        edges = [
+            (label, edge[0].__digest) + edge[1:]
+            for label, edge in self.__incoming_edge_map.items()
+        ]
+        text = repr((type(self).__name__, self.name, args, kwargs, edges))
+        return hashlib.md5(text.encode('utf-8')).hexdigest()
 
     @property
     def short_hash(self):
-        return '{:x}'.format(abs(hash(self)))[:12]
+        """A short digest of the node and everything upstream of it, for display.
+
+        Unlike ``hash()``, it is stable across processes and tells apart nodes that
+        merely share a hash.
+        """
+        if self.__digest is None:
+            # Upstream digests come first; walk iteratively to stay clear of the
+            # recursion limit on long chains.
+            pending = [self]
+            while pending:
+                node = pending[-1]
+                missing = [
+                    edge[0]
+                    for edge in node.__incoming_edge_map.values()
+                    if edge[0].__digest is None
+                ]
+                if missing:
+                    pending += missing
+                    continue
+                pending.pop()
+                if node.__digest is None:
+                    node.__digest = node.__get_digest()
+        return self.__digest[:12]
 
     def long_repr(self, include_hash=True):
         formatted_props = ['{!r}'.format(arg) for arg in self.args]
         formatted_props += [
-            '{}={!r}'.format(key, self.kwargs[key]) for key in sorted(self.kwargs)
+            '{}={!r}'.format(key, value) for key, value in self._sorted_kwargs
         ]
         out = '{}({})'.format(self.name, ', '.join(formatted_props))
         if include_hash:
@@ -197,8 +256,9 @@ class KwargReprNode(DagNode):
 
 
 def topo_sort(downstream_nodes):
-    marked_nodes = []
+    marked_nodes = set()
     sorted_nodes = []
+    sorted_node_set = set()
     outgoing_edge_maps = {}
 
     def visit(
@@ -220,8 +280,8 @@ def topo_sort(downstream_nodes):
             outgoing_edge_map[upstream_label] = outgoing_edge_infos
             outgoing_edge_maps[upstream_node] = outgoing_edge_map
 
-        if upstream_node not in sorted_nodes:
-            marked_nodes.append(upstream_node)
+        if upstream_node not in sorted_node_set:
+            marked_nodes.add(upstream_node)
             for edge in upstream_node.incoming_edges:
                 visit(
                     edge.upstream_node,
@@ -232,6 +292,7 @@ def topo_sort(downstream_nodes):
                 )
             marked_nodes.remove(upstream_node)
             sorted_nodes.append(upstream_node)
+            sorted_node_set.add(upstream_node)
 
     unmarked_nodes = [(node, None) for node in downstream_nodes]
     while unmarked_nodes:
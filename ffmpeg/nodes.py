@@ -1,21 +1,11 @@
 from __future__ import unicode_literals
 
-from past.builtins import basestring
 from .dag import KwargReprNode
-from ._utils import escape_chars, get_hash_int
+from ._utils import basestring, escape_chars
 from builtins import object
 import os
 
 
-def _is_of_types(obj, types):
-    valid = False
-    for stream_type in types:
-        if isinstance(obj, stream_type):
-            valid = True
-            break
-    return valid
-
-
 def _get_types_str(types):
     return ', '.join(['{}.{}'.format(x.__module__, x.__name__) for x in types])
 
@@ -28,7 +18,9 @@ class Stream(object):
     def __init__(
         self, upstream_node, upstream_label, node_types, upstream_selector=None
     ):
-        if not _is_of_types(upstream_node, node_types):
+        if not isinstance(node_types, tuple):
+            node_types = tuple(node_types)
+        if not isinstance(upstream_node, node_types):
             raise TypeError(
                 'Expected upstream node to be of one of the following type(s): {}; got {}'.format(
                     _get_types_str(node_types), type(upstream_node)
@@ -37,12 +29,22 @@ class Stream(object):
         self.node = upstream_node
         self.label = upstream_label
         self.selector = upstream_selector
+        self.__hash = None
 
     def __hash__(self):
-        return get_hash_int([hash(self.node), hash(self.label)])
+        if self.__hash is None:
+            self.__hash = hash((self.node, self.label, self.selector))
+        return self.__hash
 
     def __eq__(self, other):
-        return hash(self) == hash(other)
+        # Equal hashes don't imply equal streams (``hash(-1) == hash(-2)``).
+        return (
+            isinstance(other, Stream)
+            and hash(self) == hash(other)
+            and self.label == other.label
+            and self.selector == other.selector
+            and self.node == other.node
+        )
 
     def __repr__(self):
         node_repr = self.node.long_repr(include_hash=False)
@@ -137,7 +139,7 @@ def get_stream_map(stream_spec):
 
 def get_stream_map_nodes(stream_map):
     nodes = []
-    for stream in list(stream_map.values()):
+    for stream in stream_map.values():
         if not isinstance(stream, Stream):
             raise TypeError('Expected Stream; got {}'.format(type(stream)))
         nodes.append(stream.node)
@@ -152,6 +154,8 @@ def get_stream_spec_nodes(stream_spec):
 class Node(KwargReprNode):
     """Node base"""
 
+    __slots__ = ('__outgoing_stream_type', '__incoming_stream_types')
+
     @classmethod
     def __check_input_len(cls, stream_map, min_inputs, max_inputs):
         if min_inputs is not None and len(stream_map) < min_inputs:
@@ -169,8 +173,8 @@ class Node(KwargReprNode):
 
     @classmethod
     def __check_input_types(cls, stream_map, incoming_stream_types):
-        for stream in list(stream_map.values()):
-            if not _is_of_types(stream, incoming_stream_types):
+        for stream in stream_map.values():
+            if not isinstance(stream, incoming_stream_types):
                 raise TypeError(
                     'Expected incoming stream(s) to be of one of the following types: {}; got {}'.format(
                         _get_types_str(incoming_stream_types), type(stream)
@@ -180,7 +184,7 @@ class Node(KwargReprNode):
     @classmethod
     def __get_incoming_edge_map(cls, stream_map):
         incoming_edge_map = {}
-        for downstream_label, upstream in list(stream_map.items()):
+        for downstream_label, upstream in stream_map.items():
             incoming_edge_map[downstream_label] = (
                 upstream.node,
                 upstream.label,
@@ -199,6 +203,8 @@ class Node(KwargReprNode):
         args=[],
         kwargs={},
     ):
+        if not isinstance(incoming_stream_types, tuple):
+            incoming_stream_types = tuple(incoming_stream_types)
         stream_map = get_stream_map(stream_spec)
         self.__check_input_len(stream_map, min_inputs, max_inputs)
         self.__check_input_types(stream_map, incoming_stream_types)
@@ -238,7 +244,7 @@ class Node(KwargReprNode):
 class FilterableStream(Stream):
     def __init__(self, upstream_node, upstream_label, upstream_selector=None):
         super(FilterableStream, self).__init__(
-            upstream_node, upstream_label, {InputNode, FilterNode}, upstream_selector
+            upstream_node, upstream_label, (InputNode, FilterNode), upstream_selector
         )
 
 
@@ -246,11 +252,13 @@ class FilterableStream(Stream):
 class InputNode(Node):
     """InputNode type"""
 
+    __slots__ = ()
+
     def __init__(self, name, args=[], kwargs={}):
         super(InputNode, self).__init__(
             stream_spec=None,
             name=name,
-            incoming_stream_types={},
+            incoming_stream_types=(),
             outgoing_stream_type=FilterableStream,
             min_inputs=0,
             max_inputs=0,
@@ -265,51 +273,54 @@ class InputNode(Node):
 
 # noinspection PyMethodOverriding
 class FilterNode(Node):
+    __slots__ = ('__filter',)
+
     def __init__(self, stream_spec, name, max_inputs=1, args=[], kwargs={}):
         super(FilterNode, self).__init__(
             stream_spec=stream_spec,
             name=name,
-            incoming_stream_types={FilterableStream},
+            incoming_stream_types=(FilterableStream,),
             outgoing_stream_type=FilterableStream,
             min_inputs=1,
             max_inputs=max_inputs,
             args=args,
             kwargs=kwargs,
         )
+        self.__filter = None
 
     """FilterNode"""
 
     def _get_filter(self, outgoing_edges):
-        args = self.args
-        kwargs = self.kwargs
         if self.name in ('split', 'asplit'):
-            args = [len(outgoing_edges)]
-
-        out_args = [escape_chars(x, '\\\'=:') for x in args]
-        out_kwargs = {}
-        for k, v in list(kwargs.items()):
-            k = escape_chars(k, '\\\'=:')
-            v = escape_chars(v, '\\\'=:')
-            out_kwargs[k] = v
-
-        arg_params = [escape_chars(v, '\\\'=:') for v in out_args]
-        kwarg_params = ['{}={}'.format(k, out_kwargs[k]) for k in sorted(out_kwargs)]
-        params = arg_params + kwarg_params
+            # The split count depends on the outgoing edges, so it can't be cached.
+            return self.__format_filter([len(outgoing_edges)])
+        if self.__filter is None:
+            self.__filter = self.__format_filter(self.args)
+        return self.__filter
+
+    def __format_filter(self, args):
+        params = [escape_chars(escape_chars(x, '\\\'=:'), '\\\'=:') for x in args]
+        params.extend(
+            escape_chars(k, '\\\'=:') + '=' + escape_chars(v, '\\\'=:')
+            for k, v in self._sorted_kwargs
+        )
 
         params_text = escape_chars(self.name, '\\\'=:')
 
         if params:
-            params_text += '={}'.format(':'.join(params))
+            params_text += '=' + ':'.join(params)
         return escape_chars(params_text, '\\\'[],;')
 
 
 # noinspection PyMethodOverriding
 class OutputNode(Node):
+    __slots__ = ()
+
     def __init__(self, stream, name, args=[], kwargs={}):
         super(OutputNode, self).__init__(
             stream_spec=stream,
             name=name,
-            incoming_stream_types={FilterableStream},
+            incoming_stream_types=(FilterableStream,),
             outgoing_stream_type=OutputStream,
             min_inputs=1,
             max_inputs=None,
@@ -327,18 +338,20 @@ class OutputStream(Stream):
         super(OutputStream, self).__init__(
             upstream_node,
             upstream_label,
-            {OutputNode, GlobalNode, MergeOutputsNode},
+            (OutputNode, GlobalNode, MergeOutputsNode),
             upstream_selector=upstream_selector,
         )
 
 
 # noinspection PyMethodOverriding
 class MergeOutputsNode(Node):
+    __slots__ = ()
+
     def __init__(self, streams, name):
         super(MergeOutputsNode, self).__init__(
             stream_spec=streams,
             name=name,
-            incoming_stream_types={OutputStream},
+            incoming_stream_types=(OutputStream,),
             outgoing_stream_type=OutputStream,
             min_inputs=1,
             max_inputs=None,
@@ -347,11 +360,13 @@ class MergeOutputsNode(Node):
 
 # noinspection PyMethodOverriding
 class GlobalNode(Node):
+    __slots__ = ()
+
     def __init__(self, stream, name, args=[], kwargs={}):
         super(GlobalNode, self).__init__(
             stream_spec=stream,
             name=name,
-            incoming_stream_types={OutputStream},
+            incoming_stream_types=(OutputStream,),
             outgoing_stream_type=OutputStream,
             min_inputs=1,
             max_inputs=1,
@@ -360,21 +375,40 @@ class GlobalNode(Node):
         )
 
 
-def stream_operator(stream_classes={Stream}, name=None):
+def _add_operator(func, stream_classes, name=None):
+    func_name = name or func.__name__
+    for stream_class in stream_classes:
+        setattr(stream_class, func_name, func)
+    return func
+
+
+def stream_operator(stream_classes=None, name=None):
+    """Register the decorated function as a method of ``stream_classes``.
+
+    Can be applied either bare (``@stream_operator``) or called
+    (``@stream_operator(name='foo')``).
+    """
+    if callable(stream_classes):
+        return _add_operator(stream_classes, (Stream,))
+    if stream_classes is None:
+        stream_classes = (Stream,)
+
     def decorator(func):
-        func_name = name or func.__name__
-        [setattr(stream_class, func_name, func) for stream_class in stream_classes]
-        return func
+        return _add_operator(func, stream_classes, name)
 
     return decorator
 
 
 def filter_operator(name=None):
-    return stream_operator(stream_classes={FilterableStream}, name=name)
+    if callable(name):
+        return _add_operator(name, (FilterableStream,))
+    return stream_operator(stream_classes=(FilterableStream,), name=name)
 
 
 def output_operator(name=None):
-    return stream_operator(stream_classes={OutputStream}, name=name)
+    if callable(name):
+        return _add_operator(name, (OutputStream,))
+    return stream_operator(stream_classes=(OutputStream,), name=name)
 
 
 __all__ = ['Stream']
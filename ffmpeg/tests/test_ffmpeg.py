@@ -3,12 +3,15 @@ from builtins import bytes
 from builtins import range
 from builtins import str
 import ffmpeg
+import gc
+import io
 import os
 import pytest
 import random
 import re
 import subprocess
 import sys
+import weakref
 
 
 try:
@@ -54,6 +57,68 @@ def test_fluent_equality():
     assert t1 != t5
 
 
+def test_node_equality():
+    base = ffmpeg.input('dummy.mp4')
+    assert base.hflip().node != base.vflip().node
+    assert base.trim(start=1).node != base.trim(start=1.0).node
+    assert base.filter('setpts', 'PTS').node == base.setpts('PTS').node
+    assert base.video == base['v']
+    assert base.video != base.audio
+    split = base.filter_multi_output('split')
+    assert split[-1] != split[-2]
+    assert base.hue(h=-1) != base.hue(h=-2)
+    out1 = base.output('out.mp4', streamid=['0:0x101', '1:0x102'])
+    out2 = base.output('out.mp4', streamid=['0:0x101', '1:0x102'])
+    out3 = base.output('out.mp4', streamid=['0:0x101', '1:0x103'])
+    assert out1.node == out2.node
+    assert out1.node != out3.node
+    # ``hash(-1) == hash(-2)`` in CPython; nodes must still compare unequal.
+    assert base.hue(h=-1).node != base.hue(h=-2).node
+    assert ffmpeg.merge_outputs(
+        base.hue(h=-1).output('a.mp4'), base.hue(h=-2).output('b.mp4')
+    ).get_args() == [
+        '-i',
+        'dummy.mp4',
+        '-filter_complex',
+        '[0]hue=h=-1[s0];[0]hue=h=-2[s1]',
+        '-map',
+        '[s0]',
+        'a.mp4',
+        '-map',
+        '[s1]',
+        'b.mp4',
+    ]
+    overlay_file = ffmpeg.input('overlay.png')
+    assert (
+        base.overlay(overlay_file, x=-1).node != base.overlay(overlay_file, x=-2).node
+    )
+
+
+def test_view_distinct_nodes(mocker):
+    graphviz__mock = mock.Mock()
+    mocker.patch.dict(sys.modules, {'graphviz': graphviz__mock})
+    base = ffmpeg.input('dummy.mp4')
+    ffmpeg.merge_outputs(
+        base.hue(h=-1).output('a.mp4'), base.hue(h=-2).output('b.mp4')
+    ).view(pipe=True)
+    graph = graphviz__mock.Digraph.return_value
+    node_ids = {args[0] for args, _ in graph.node.call_args_list}
+    assert len(node_ids) == 6
+    edges = {args for args, _ in graph.edge.call_args_list}
+    assert len(edges) == 6
+    assert {x for edge in edges for x in edge} == node_ids
+
+
+def test_node_equality_long_chain():
+    def build_chain():
+        stream = ffmpeg.input('dummy.mp4')
+        for i in range(3000):
+            stream = stream.filter('fps', fps=i)
+        return stream
+
+    assert build_chain().node == build_chain().node
+
+
 def test_fluent_concat():
     base = ffmpeg.input('dummy.mp4')
     trimmed1 = base.trim(start_frame=10, end_frame=20)
@@ -66,6 +131,79 @@ def test_fluent_concat():
     assert concat1 != concat3
 
 
+def test_fluent_filter_node_reuse():
+    base = ffmpeg.input('dummy.mp4')
+    assert base.hflip() is base.hflip()
+    assert base.split() is base.split()
+    assert base.trim(start_frame=10).node is base.trim(start_frame=10).node
+    assert base.trim(start_frame=10).node is not base.trim(start_frame=10.0).node
+    assert base.video.hflip().node is not base.audio.hflip().node
+    assert base.hue(h=[1]).node is not base.hue(h=[1]).node
+    # Upstream nodes whose hashes collide (``hash(-1) == hash(-2)``) must not share
+    # cached downstream nodes.
+    hue1 = base.hue(h=-1)
+    hue2 = base.hue(h=-2)
+    assert hue1.hflip().node.incoming_edges[0].upstream_node is hue1.node
+    assert hue2.hflip().node.incoming_edges[0].upstream_node is hue2.node
+    assert hue2.split().incoming_edges[0].upstream_node is hue2.node
+
+
+def test_nodes_have_no_dict():
+    out = ffmpeg.input('dummy.mp4').hflip().output('dummy2.mp4')
+    stream = ffmpeg.merge_outputs(out).overwrite_output()
+    nodes, _ = ffmpeg.dag.topo_sort([stream.node])
+    assert len(nodes) == 5
+    for node in nodes:
+        assert not hasattr(node, '__dict__')
+
+
+def test_node_types_as_sets():
+    base = ffmpeg.input('dummy.mp4')
+    node = ffmpeg.nodes.FilterNode(base, 'hflip')
+    stream = ffmpeg.nodes.Stream(node, None, {ffmpeg.nodes.FilterNode})
+    assert stream.node is node
+    with pytest.raises(TypeError):
+        ffmpeg.nodes.Stream(node, None, {ffmpeg.nodes.InputNode})
+    ffmpeg.nodes.Node(
+        base,
+        'custom',
+        {ffmpeg.nodes.FilterableStream},
+        ffmpeg.nodes.FilterableStream,
+        min_inputs=1,
+        max_inputs=1,
+    )
+    with pytest.raises(TypeError):
+        ffmpeg.nodes.Node(
+            base,
+            'custom',
+            {ffmpeg.nodes.OutputStream},
+            ffmpeg.nodes.OutputStream,
+            min_inputs=1,
+            max_inputs=1,
+        )
+
+
+def test_filter_operator_registers_plain_functions():
+    # Fluent calls dispatch straight to the module-level function, no wrapper.
+    assert vars(ffmpeg.nodes.FilterableStream)['hflip'] is ffmpeg.hflip
+    assert vars(ffmpeg.nodes.FilterableStream)['filter_'] is ffmpeg.filter_
+    assert vars(ffmpeg.nodes.OutputStream)['run'] is ffmpeg.run
+
+
+def test_filter_operator_forms():
+    def _custom(stream):
+        return stream.filter('custom')
+
+    try:
+        ffmpeg.nodes.filter_operator(_custom)
+        ffmpeg.nodes.filter_operator(name='_custom2')(_custom)
+        stream = ffmpeg.input('dummy.mp4')
+        assert stream._custom().node == stream._custom2().node
+    finally:
+        del ffmpeg.nodes.FilterableStream._custom
+        del ffmpeg.nodes.FilterableStream._custom2
+
+
 def test_fluent_output():
     ffmpeg.input('dummy.mp4').trim(start_frame=10, end_frame=20).output('dummy2.mp4')
 
@@ -104,6 +242,23 @@ def test_node_repr():
     )
 
 
+def test_short_hash():
+    base = ffmpeg.input('dummy.mp4')
+    assert base.hue(h=-1).node.short_hash != base.hue(h=-2).node.short_hash
+    assert base.trim(start=1).node.short_hash != base.trim(start=1.0).node.short_hash
+
+    # Stable across processes, unlike the randomized builtin string hash.
+    code = 'import ffmpeg; print(ffmpeg.input("dummy.mp4").hflip().node.short_hash)'
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(ffmpeg.__file__)))
+    short_hashes = {
+        subprocess.check_output(
+            [sys.executable, '-c', code], env=dict(env, PYTHONHASHSEED=seed)
+        )
+        for seed in ['1', '2']
+    }
+    assert short_hashes == {'{}\n'.format(base.hflip().node.short_hash).encode()}
+
+
 def test_stream_repr():
     in_file = ffmpeg.input('dummy.mp4')
     assert repr(in_file) == 'input(filename={!r})[None] <{}>'.format(
@@ -200,6 +355,91 @@ def test__get_args__complex_filter():
     ]
 
 
+def test_filter_split_count_follows_outputs():
+    split = ffmpeg.input('in.mp4').split()
+    out1 = split[0].output('out1.mp4')
+    out2 = split[1].output('out2.mp4')
+    assert '[0]split=1[s0]' in out1.get_args()
+    assert '[0]split=2[s0][s1]' in ffmpeg.merge_outputs(out1, out2).get_args()
+    assert '[0]split=1[s0]' in out2.get_args()
+
+
+def test__get_args__filter_complex_not_written_to_file(mocker):
+    mocker.patch.object(ffmpeg._run, '_MAX_FILTER_COMPLEX_ARG_LEN', 20)
+    mkstemp__mock = mocker.patch('tempfile.mkstemp')
+    out = ffmpeg.input('in.mp4').hflip().vflip().output('out.mp4')
+    expected_args = [
+        '-i',
+        'in.mp4',
+        '-filter_complex',
+        '[0]hflip[s0];[s0]vflip[s1]',
+        '-map',
+        '[s1]',
+        'out.mp4',
+    ]
+    assert out.get_args() == expected_args
+    assert out.get_args() == expected_args
+    assert not mkstemp__mock.called
+    assert not ffmpeg._run._filter_complex_scripts
+
+
+def test__run_async__filter_complex_script(mocker):
+    mocker.patch.object(ffmpeg._run, '_MAX_FILTER_COMPLEX_ARG_LEN', 20)
+    popen__mock = mocker.patch.object(subprocess, 'Popen')
+    ffmpeg.input('in.mp4').hflip().vflip().output('out.mp4').run_async()
+    (args,), _ = popen__mock.call_args
+    assert args[:4] == ['ffmpeg', '-i', 'in.mp4', '-filter_complex_script']
+    assert args[5:] == ['-map', '[s1]', 'out.mp4']
+    try:
+        with io.open(args[4], encoding='utf-8') as f:
+            assert f.read() == '[0]hflip[s0];[s0]vflip[s1]'
+    finally:
+        ffmpeg._run._remove_filter_complex_script(args[4])
+
+
+@pytest.mark.skipif(
+    not hasattr(weakref, 'finalize'), reason='needs weakref.finalize (Python 3)'
+)
+def test__run_async__filter_complex_script_removed_with_process(mocker):
+    mocker.patch.object(ffmpeg._run, '_MAX_FILTER_COMPLEX_ARG_LEN', 20)
+    popen__mock = mocker.patch.object(
+        subprocess, 'Popen', side_effect=lambda *args, **kwargs: mock.Mock()
+    )
+    out = ffmpeg.input('in.mp4').hflip().vflip().output('out.mp4')
+    process = out.run_async()
+    (args,), _ = popen__mock.call_args
+    assert os.path.exists(args[4])
+    del process
+    gc.collect()
+    assert not os.path.exists(args[4])
+    assert not ffmpeg._run._filter_complex_scripts
+
+
+def test__run_async__filter_complex_script_counts_bytes(mocker):
+    mocker.patch.object(ffmpeg._run, '_MAX_FILTER_COMPLEX_ARG_LEN', 40)
+    popen__mock = mocker.patch.object(subprocess, 'Popen')
+    text = '\u5b57' * 10
+    ffmpeg.input('in.mp4').drawtext(text=text).output('out.mp4').run_async()
+    (args,), _ = popen__mock.call_args
+    # 31 characters, but 51 bytes once encoded.
+    assert args[3] == '-filter_complex_script'
+    try:
+        with io.open(args[4], encoding='utf-8') as f:
+            assert f.read() == '[0]drawtext=text={}[s0]'.format(text)
+    finally:
+        ffmpeg._run._remove_filter_complex_script(args[4])
+
+
+def test__run__filter_complex_script_removed(mocker):
+    mocker.patch.object(ffmpeg._run, '_MAX_FILTER_COMPLEX_ARG_LEN', 20)
+    popen__mock = mocker.patch.object(subprocess, 'Popen', wraps=subprocess.Popen)
+    ffmpeg.input('in.mp4').hflip().vflip().output('out.mp4').run(cmd='true')
+    (args,), _ = popen__mock.call_args
+    assert args[3] == '-filter_complex_script'
+    assert not os.path.exists(args[4])
+    assert not ffmpeg._run._filter_complex_scripts
+
+
 def test_combined_output():
     i1 = ffmpeg.input(TEST_INPUT_FILE1)
     i2 = ffmpeg.input(TEST_OVERLAY_FILE)